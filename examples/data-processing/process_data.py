@@ -3,6 +3,7 @@ import canedge_browser
 import can_decoder
 
 import pandas as pd
+import numpy as np
 from datetime import datetime, timezone
 from utils import setup_fs, load_dbc_files, restructure_data, add_custom_sig, ProcessData
 
@@ -32,7 +33,7 @@ for log_file in log_files:
 # --------------------------------------------
 # example: Add a custom signal
 def ratio(s1, s2):
-    return s2 / s1 if s1 else np.nan
+    return s2 / s1.replace(0, np.nan)
 
 
 df_phys_all = add_custom_sig(df_phys_all, "WheelBasedVehicleSpeed", "EngineSpeed", ratio, "RatioRpmSpeed")
@@ -91,20 +91,25 @@ def restructure_data(df_phys, res):
 
 def add_custom_sig(df_phys, signal1, signal2, function, new_signal):
     """Helper function for calculating a new signal based on two signals and a function.
+    The function is called once with the two signals as aligned pandas Series (i.e. it should be vectorized).
     Returns a dataframe with the new signal name and physical values
     """
-    import pandas as pd
-
     try:
-        s1 = df_phys[df_phys["Signal"] == signal1]["Physical Value"].rename(signal1)
-        s2 = df_phys[df_phys["Signal"] == signal2]["Physical Value"].rename(signal2)
+        s1 = df_phys[df_phys["Signal"] == signal1]["Physical Value"]
+        s2 = df_phys[df_phys["Signal"] == signal2]["Physical Value"]
+
+        # align both signals on the union of their timestamps, forward filling the gaps
+        s1 = s1[~s1.index.duplicated(keep="last")]
+        s2 = s2[~s2.index.duplicated(keep="last")]
+        timestamps = s1.index.union(s2.index)
+        s1 = s1.reindex(timestamps).ffill()
+        s2 = s2.reindex(timestamps).ffill()
 
-        df_new_sig = pd.merge_ordered(s1, s2, on="TimeStamp", fill_method="ffill",).set_index("TimeStamp")
-        df_new_sig = df_new_sig.apply(lambda x: function(x[0], x[1]), axis=1).dropna().rename("Physical Value").to_frame()
+        df_new_sig = function(s1, s2).dropna().rename("Physical Value").to_frame()
         df_new_sig["Signal"] = new_signal
         df_phys = df_phys.append(df_new_sig)
 
-    except:
+    except (KeyError, ValueError):
         print(f"Warning: Custom signal {new_signal} not created\n")
 
     return df_phys
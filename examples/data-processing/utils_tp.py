@@ -24,16 +24,151 @@ class MultiFrameDecoder:
 
         return
 
-    def construct_new_tp_frame(self, base_frame, payload_concatenated, can_id):
-        new_frame = base_frame
-        new_frame.at["DataBytes"] = payload_concatenated
-        new_frame.at["DLC"] = 0
-        new_frame.at["DataLength"] = len(payload_concatenated)
+    def construct_new_tp_frames(self, base_frame, col_positions, payloads, can_ids, index):
+        """Given a base frame and the combined payloads and CAN IDs, construct a dataframe of new
+        frames. All other columns are copied from the base frame
+        """
+        import pandas as pd
+        import numpy as np
+
+        i_db, i_dlc, i_dl, i_id = col_positions
+
+        # fill a pre-allocated array with the base frame values, then set the changed columns directly
+        base_row = base_frame.to_numpy(dtype=object)
+        frames = np.empty((len(payloads), len(base_row)), dtype=object)
+        frames[:] = base_row
+
+        frames[:, i_dlc] = 0
+        frames[:, i_dl] = [len(payload) for payload in payloads]
+        frames[:, i_id] = [can_id if can_id else base_row[i_id] for can_id in can_ids]
+
+        # payloads are set cell by cell, as equal length lists would otherwise be broadcast as a 2D array
+        for k, payload in enumerate(payloads):
+            frames[k, i_db] = payload
+
+        df_raw_tp = pd.DataFrame(frames, columns=base_frame.index, index=index)
+
+        # keep the dtypes of the raw data, so the concatenated data has the same dtypes as the input -
+        # only the data length dtype is widened if the combined payloads exceed it (e.g. uint8)
+        dtypes = self.df_raw.dtypes.to_dict()
+        max_length = max((len(payload) for payload in payloads), default=0)
+        dtypes["DataLength"] = np.promote_types(dtypes["DataLength"], np.min_scalar_type(max_length))
 
-        if can_id:
-            new_frame.at["ID"] = can_id
+        return df_raw_tp.astype(dtypes)
 
-        return new_frame
+    def combine_tp_payloads(
+        self,
+        ids,
+        payloads,
+        SINGLE_FRAME_MASK,
+        FIRST_FRAME_MASK,
+        CONSEQ_FRAME_MASK,
+        SINGLE_FRAME,
+        FIRST_FRAME,
+        CONSEQ_FRAME,
+        first_frame_payload_start,
+        conseq_frame_payload_start,
+        tp_type,
+        is_bam,
+        bam_id,
+    ):
+        """Given the CAN IDs and payloads of frames filtered by a response ID, identify single frames
+        and multi frame sequences. Returns the row positions, payloads and CAN IDs of the combined frames
+        """
+        import numpy as np
+
+        # classify the frame types for all frames at once based on the 1st byte
+        first_bytes = np.fromiter((payload[0] for payload in payloads), dtype=np.uint8, count=len(payloads))
+        is_single = ((first_bytes & SINGLE_FRAME_MASK) == SINGLE_FRAME).tolist()
+        is_conseq = ((first_bytes & CONSEQ_FRAME_MASK) == CONSEQ_FRAME).tolist()
+
+        # for BAM based protocols (e.g. J1939) the BAM message marks the first frame
+        if is_bam:
+            is_first = (np.asarray(ids) == bam_id).tolist()
+        else:
+            is_first = ((first_bytes & FIRST_FRAME_MASK) == FIRST_FRAME).tolist()
+
+        positions = []
+        payloads_out = []
+        ids_out = []
+
+        payload_concatenated = bytearray()
+        write_pos = 0
+        ff_length = 0xFFF
+        can_id = None
+        conseq_frame_prev = None
+        frame_position = None
+
+        # iterate through the frames in the filtered data
+        for i in range(len(ids)):
+            payload = payloads[i]
+            row_id = ids[i]
+
+            # if single frame, save frame directly (excl. 1st byte)
+            if is_single[i]:
+                positions.append(i)
+                payloads_out.append(payload)
+                ids_out.append(row_id)
+
+            # if first frame, save info from prior multi frame response sequence,
+            # then initialize a new sequence incl. the first frame payload
+            elif is_first[i]:
+                # create a new frame using information from previous iterations
+                if write_pos >= ff_length:
+                    positions.append(frame_position)
+                    payloads_out.append(list(payload_concatenated[:write_pos]))
+                    ids_out.append(can_id)
+
+                # reset and start on next frame
+                conseq_frame_prev = None
+                frame_position = i
+
+                # for J1939 BAM, extract PGN and convert to 29 bit CAN ID for use in baseframe
+                if is_bam:
+                    pgn = int.from_bytes(payload[5:8], "little")
+                    can_id = (6 << 26) | (pgn << 8) | 254
+
+                # extract the total payload length from the first frame (UDS) or BAM (J1939)
+                if tp_type == "uds":
+                    ff_length = (payload[0] & 0x0F) << 8 | payload[1]
+                    total_length = ff_length
+                elif tp_type == "j1939":
+                    total_length = payload[1] | payload[2] << 8
+                else:
+                    total_length = 0
+
+                # pre-allocate the combined payload - bytes beyond the total length (e.g. padding) extend it
+                payload_concatenated = bytearray(total_length)
+                frame_payload = payload[first_frame_payload_start:]
+                payload_concatenated[0 : len(frame_payload)] = frame_payload
+                write_pos = len(frame_payload)
+
+            # if consequtive frame, extend payload with payload excl. 1st byte
+            elif is_conseq[i]:
+                first_byte = payload[0]
+                if (conseq_frame_prev == None) or ((first_byte - conseq_frame_prev) == 1):
+                    conseq_frame_prev = first_byte
+                    frame_payload = payload[conseq_frame_payload_start:]
+                    payload_concatenated[write_pos : write_pos + len(frame_payload)] = frame_payload
+                    write_pos += len(frame_payload)
+
+        return positions, payloads_out, ids_out
+
+    def construct_tp_frames(self, df_raw_filter, col_positions, tp_args):
+        """Given raw data filtered by channel and response ID, combine the transport protocol
+        frames and return a dataframe of the new frames, constructed based on the first frame
+        """
+        base_frame = df_raw_filter.iloc[0]
+
+        # extract the columns used by the frame matching as plain arrays
+        ids = df_raw_filter["ID"].to_numpy()
+        payloads = df_raw_filter["DataBytes"].tolist()
+
+        positions, payloads_out, ids_out = self.combine_tp_payloads(ids, payloads, **tp_args)
+
+        return self.construct_new_tp_frames(
+            base_frame, col_positions, payloads_out, ids_out, df_raw_filter.index[positions]
+        )
 
     def combine_tp_frames(
         self,
@@ -49,84 +184,56 @@ class MultiFrameDecoder:
         bam_id_hex="",
     ):
         import pandas as pd
-        import sys
+        import numpy as np
 
-        df_raw_combined = pd.DataFrame()
+        # positions of the columns set in the new frames, resolved once for all channels/response IDs
+        columns = self.df_raw.columns
+        col_positions = tuple(columns.get_loc(name) for name in ["DataBytes", "DLC", "DataLength", "ID"])
 
-        df_raw_excl_tp = self.df_raw[~self.df_raw["ID"].isin(self.res_id_list)]
-        df_raw_combined = df_raw_excl_tp
+        is_bam = bam_id_hex != ""
 
-        for channel, df_raw_channel in self.df_raw.groupby("BusChannel"):
-            for res_id in self.res_id_list:
-                # filter raw data for response ID and extract a 'base frame'
-                if bam_id_hex == "":
-                    bam_id = 0
-                else:
-                    bam_id = int(bam_id_hex, 16)
+        if is_bam:
+            bam_id = int(bam_id_hex, 16)
+        else:
+            bam_id = 0
+
+        # passed by keyword, so the protocol constants cannot be misassigned by their order
+        tp_args = dict(
+            SINGLE_FRAME_MASK=SINGLE_FRAME_MASK,
+            FIRST_FRAME_MASK=FIRST_FRAME_MASK,
+            CONSEQ_FRAME_MASK=CONSEQ_FRAME_MASK,
+            SINGLE_FRAME=SINGLE_FRAME,
+            FIRST_FRAME=FIRST_FRAME,
+            CONSEQ_FRAME=CONSEQ_FRAME,
+            first_frame_payload_start=first_frame_payload_start,
+            conseq_frame_payload_start=conseq_frame_payload_start,
+            tp_type=tp_type,
+            is_bam=is_bam,
+            bam_id=bam_id,
+        )
 
-                df_raw_filter = df_raw_channel[df_raw_channel["ID"].isin([res_id, bam_id])]
+        # match the response IDs (and BAM ID) against the raw data once, outside the loops
+        id_col = self.df_raw["ID"].to_numpy()
+        res_id_masks = {
+            res_id: np.isin(id_col, [res_id, bam_id] if is_bam else [res_id]) for res_id in self.res_id_list
+        }
 
-                if df_raw_filter.empty:
-                    continue
+        df_raw_excl_tp = self.df_raw[~np.isin(id_col, self.res_id_list)]
 
-                base_frame = df_raw_filter.iloc[0]
+        # filter raw data by channel and response ID - each subset is processed independently
+        filter_idx_list = [
+            channel_idx[res_id_masks[res_id][channel_idx]]
+            for channel_idx in self.df_raw.groupby("BusChannel").indices.values()
+            for res_id in self.res_id_list
+        ]
 
-                frame_list = []
-                frame_timestamp_list = []
-                payload_concatenated = []
-                ff_length = 0xFFF
-                can_id = None
-                conseq_frame_prev = None
-
-                # iterate through rows in filtered dataframe
-                for index, row in df_raw_filter.iterrows():
-                    payload = row["DataBytes"]
-                    first_byte = payload[0]
-                    row_id = row["ID"]
-
-                    # if single frame, save frame directly (excl. 1st byte)
-                    if first_byte & SINGLE_FRAME_MASK == SINGLE_FRAME:
-                        new_frame = self.construct_new_tp_frame(base_frame, payload, row_id)
-                        frame_list.append(new_frame.values.tolist())
-                        frame_timestamp_list.append(index)
-
-                    # if first frame, save info from prior multi frame response sequence,
-                    # then initialize a new sequence incl. the first frame payload
-                    elif ((first_byte & FIRST_FRAME_MASK == FIRST_FRAME) & (bam_id_hex == "")) or (bam_id == row_id):
-                        # create a new frame using information from previous iterations
-                        if len(payload_concatenated) >= ff_length:
-                            new_frame = self.construct_new_tp_frame(base_frame, payload_concatenated, can_id)
-
-                            frame_list.append(new_frame.values.tolist())
-                            frame_timestamp_list.append(frame_timestamp)
-
-                        # reset and start on next frame
-                        payload_concatenated = []
-                        conseq_frame_prev = None
-                        frame_timestamp = index
-
-                        # for J1939 BAM, extract PGN and convert to 29 bit CAN ID for use in baseframe
-                        if bam_id_hex != "":
-                            pgn_hex = "".join("{:02x}".format(x) for x in reversed(payload[5:8]))
-                            pgn = int(pgn_hex, 16)
-                            can_id = (6 << 26) | (pgn << 8) | 254
-
-                        if tp_type == "uds":
-                            ff_length = (payload[0] & 0x0F) << 8 | payload[1]
-
-                        for byte in payload[first_frame_payload_start:]:
-                            payload_concatenated.append(byte)
-
-                    # if consequtive frame, extend payload with payload excl. 1st byte
-                    elif first_byte & CONSEQ_FRAME_MASK == CONSEQ_FRAME:
-                        if (conseq_frame_prev == None) or ((first_byte - conseq_frame_prev) == 1):
-                            conseq_frame_prev = first_byte
-                            for byte in payload[conseq_frame_payload_start:]:
-                                payload_concatenated.append(byte)
-
-                df_raw_tp = pd.DataFrame(frame_list, columns=base_frame.index, index=frame_timestamp_list)
-                df_raw_combined = df_raw_combined.append(df_raw_tp)
+        tp_frames = [
+            self.construct_tp_frames(self.df_raw.iloc[filter_idx], col_positions, tp_args)
+            for filter_idx in filter_idx_list
+            if len(filter_idx) > 0
+        ]
 
+        df_raw_combined = pd.concat([df_raw_excl_tp] + tp_frames)
         df_raw_combined.index.name = "TimeStamp"
         df_raw_combined = df_raw_combined.sort_index()
 
@@ -135,20 +242,15 @@ class MultiFrameDecoder:
     def decode_tp_data(self, df_raw_combined, df_decoder):
         import pandas as pd
 
-        df_phys_list = []
-
         # to process data with variable payload lengths for the same ID
         # it needs to be processed group-by-group based on the data length:
         if df_raw_combined.empty:
             return df_raw_combined
         else:
-            df_grouped = df_raw_combined.groupby("DataLength")
-            df_phys = pd.DataFrame()
-            for length, group in df_grouped:
-                df_phys_group = df_decoder.decode_frame(group)
-                df_phys = df_phys.append(df_phys_group)
-
-            df_phys = df_phys.sort_index()
+            data_length = pd.Categorical(df_raw_combined["DataLength"])
+            df_grouped = df_raw_combined.groupby(data_length, observed=True, sort=False)
+            df_phys_list = [df_decoder.decode_frame(group) for length, group in df_grouped]
+            df_phys = pd.concat(df_phys_list).sort_index()
             return df_phys
 
     def combine_tp_frames_by_type(self, tp_type):